@@ -5,129 +5,502 @@ A Python application to send messages to a classic ActiveMQ V5 queue.
 """
 
 import argparse
-import json
-import random
+import itertools
+import os
 import string
 import sys
+import threading
 import time
-import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 import stomp
 
+try:
+    from proton import Delivery, Link, Message
+    from proton.utils import BlockingConnection
+except ImportError:  # qpid-proton is only needed for --protocol amqp
+    BlockingConnection = None
+
+# Maps every byte value onto the original [A-Za-z0-9] payload alphabet
+_ALPHABET = (string.ascii_letters + string.digits).encode('ascii')
+_ALPHABET_TABLE = bytes(_ALPHABET[i % len(_ALPHABET)] for i in range(256))
+
+# Serialized size of a JSON message with empty timestamp, message_id and data values
+_JSON_OVERHEAD = len('{"timestamp": "", "message_id": "", "type": "test_message", "data": ""}')
+
+# Size of an XML message with empty timestamp and message_id elements, measured (as ElementTree
+# serializes it) with a short <data /> element so that --size keeps its original meaning.
+# Messages are the same size as ElementTree's output whenever the timestamp has microseconds.
+_XML_OVERHEAD = len('<message><timestamp></timestamp><message_id></message_id>'
+                    '<type>test_message</type><data /></message>')
+
+# Fixed widths of the per-message fields, so all messages of one size share a layout
+_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+_TIMESTAMP_WIDTH = 26
+_MESSAGE_ID_WIDTH = 6
+
+# Source of sequential six-digit message ids, cycling through 100000-999999
+_id_counter = itertools.count()
+
+# Last whole second and its ISO 8601 rendering, shared by all messages within that second
+_ts_cache = [0, b'']
+
+
+def _iso_now(fresh: bool = False) -> bytes:
+    """Return the current UTC time in ISO 8601, formatted at most once per second unless fresh."""
+    if fresh:
+        return datetime.utcnow().strftime(_TIMESTAMP_FORMAT).encode('ascii')
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache[0] = t
+        _ts_cache[1] = datetime.utcfromtimestamp(t).strftime(_TIMESTAMP_FORMAT).encode('ascii')
+    return _ts_cache[1]
+
+
+def _next_message_id() -> bytes:
+    """Return the next six-digit message id."""
+    return b'%d' % (next(_id_counter) % 900000 + 100000)
+
+
+# Reusable message buffers; list.pop() and list.append() are atomic, so the pool is thread-safe
+_builder_pool: List[bytearray] = []
+
+
+def _acquire(size: int) -> bytearray:
+    """Take a buffer of exactly size bytes from the pool, allocating one if none fits."""
+    try:
+        buf = _builder_pool.pop()
+    except IndexError:
+        return bytearray(size)
+    return buf if len(buf) == size else bytearray(size)
+
+
+def _release(buf: bytearray):
+    """Return a buffer to the pool for reuse."""
+    _builder_pool.append(buf)
+
 
 class MessageGenerator:
     """Generates message content in JSON or XML format."""
     
+    # Pre-generated random data that payloads are sliced from
+    _pool = memoryview(b'')
+    _pool_off = 0
+    
+    @classmethod
+    def ensure_pool(cls, size: int):
+        """Pre-generate at least size bytes of random data for message payloads."""
+        if len(cls._pool) < size:
+            cls._pool = memoryview(os.urandom(size).translate(_ALPHABET_TABLE))
+            cls._pool_off = 0
+    
+    @classmethod
+    def generate_random_bytes(cls, length: int) -> memoryview:
+        """Return random ASCII bytes of specified length, sliced from the shared pool."""
+        # Payload content is not meaningful, so consecutive messages may share pool data
+        cls.ensure_pool(2 * length)
+        off = cls._pool_off
+        # The stored offset was advanced for an earlier length, so wrap if this slice won't fit
+        if off + length > len(cls._pool):
+            off = 0
+        cls._pool_off = (off + length) % (len(cls._pool) - length + 1)
+        return cls._pool[off:off + length]
+    
     @staticmethod
     def generate_random_string(length: int) -> str:
         """Generate a random string of specified length."""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+        return str(MessageGenerator.generate_random_bytes(length), 'ascii')
+    
+    # Pre-rendered messages per (format, size): (head, tail, timestamp offset, message_id offset,
+    # data length). The head holds everything up to the data, with placeholder field values.
+    _templates = {}
     
     @staticmethod
-    def generate_json_message(size_bytes: int) -> str:
-        """Generate a JSON message of approximately the specified size."""
-        # Calculate how much content we need for the desired size
-        base_message = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "message_id": str(random.randint(100000, 999999)),
-            "type": "test_message",
-            "data": ""
-        }
-        
-        # Convert to JSON to calculate overhead
-        base_json = json.dumps(base_message)
-        overhead = len(base_json.encode('utf-8'))
+    def _build_json_template(size_bytes: int):
+        """Render the JSON layout (as json.dumps(indent=2) would) once, with placeholder values."""
+        head = ('{\n'
+                f'  "timestamp": "{"0" * _TIMESTAMP_WIDTH}",\n'
+                f'  "message_id": "{"0" * _MESSAGE_ID_WIDTH}",\n'
+                '  "type": "test_message",\n'
+                '  "data": "').encode('ascii')
         
         # Calculate remaining size needed for data field
+        overhead = _JSON_OVERHEAD + _TIMESTAMP_WIDTH + _MESSAGE_ID_WIDTH
         remaining_size = max(0, size_bytes - overhead - 10)  # 10 bytes buffer for quotes/formatting
         
-        # Generate random data to fill the message
-        if remaining_size > 0:
-            base_message["data"] = MessageGenerator.generate_random_string(remaining_size)
-        
-        return json.dumps(base_message, indent=2)
+        ts_offset = head.index(b'"timestamp": "') + len(b'"timestamp": "')
+        id_offset = head.index(b'"message_id": "') + len(b'"message_id": "')
+        return head, b'"\n}', ts_offset, id_offset, remaining_size
     
     @staticmethod
-    def generate_xml_message(size_bytes: int) -> str:
-        """Generate an XML message of approximately the specified size."""
-        root = ET.Element("message")
-        
-        # Add basic fields
-        timestamp_elem = ET.SubElement(root, "timestamp")
-        timestamp_elem.text = datetime.utcnow().isoformat()
-        
-        message_id_elem = ET.SubElement(root, "message_id")
-        message_id_elem.text = str(random.randint(100000, 999999))
-        
-        type_elem = ET.SubElement(root, "type")
-        type_elem.text = "test_message"
-        
-        data_elem = ET.SubElement(root, "data")
-        
-        # Calculate overhead
-        xml_str = ET.tostring(root, encoding='unicode')
-        overhead = len(xml_str.encode('utf-8'))
+    def _build_xml_template(size_bytes: int):
+        """Render the XML layout once, with placeholder timestamp and message_id values."""
+        head = (f'<message><timestamp>{"0" * _TIMESTAMP_WIDTH}</timestamp>'
+                f'<message_id>{"0" * _MESSAGE_ID_WIDTH}</message_id>'
+                '<type>test_message</type>').encode('ascii')
         
         # Calculate remaining size needed for data field
+        overhead = _XML_OVERHEAD + _TIMESTAMP_WIDTH + _MESSAGE_ID_WIDTH
         remaining_size = max(0, size_bytes - overhead - 20)  # 20 bytes buffer
         
-        # Generate random data to fill the message
-        if remaining_size > 0:
-            data_elem.text = MessageGenerator.generate_random_string(remaining_size)
+        ts_offset = len(b'<message><timestamp>')
+        id_offset = head.index(b'<message_id>') + len(b'<message_id>')
         
-        return ET.tostring(root, encoding='unicode')
+        # An empty data element is written in short form, as ElementTree did
+        if remaining_size == 0:
+            return head, b'<data /></message>', ts_offset, id_offset, 0
+        return head + b'<data>', b'</data></message>', ts_offset, id_offset, remaining_size
+    
+    @staticmethod
+    def _render(template, fresh_timestamp: bool) -> bytes:
+        """Copy a template into a pooled buffer, patch its variable fields and return the message."""
+        head, tail, ts_offset, id_offset, data_size = template
+        start = len(head)
+        end = start + data_size
+        buf = _acquire(end + len(tail))
+        try:
+            # Equal-length slice assignments overwrite the buffer in place without resizing it.
+            # None of the patched values need JSON or XML escaping.
+            buf[:start] = head
+            buf[ts_offset:ts_offset + _TIMESTAMP_WIDTH] = _iso_now(fresh_timestamp)
+            buf[id_offset:id_offset + _MESSAGE_ID_WIDTH] = _next_message_id()
+            buf[start:end] = MessageGenerator.generate_random_bytes(data_size)
+            buf[end:] = tail
+            return bytes(buf)
+        finally:
+            _release(buf)
+    
+    @staticmethod
+    def generate_json_message(size_bytes: int, fresh_timestamp: bool = False) -> bytes:
+        """Generate a UTF-8 encoded JSON message of approximately the specified size."""
+        template = MessageGenerator._templates.get(('json', size_bytes))
+        if template is None:
+            template = MessageGenerator._build_json_template(size_bytes)
+            MessageGenerator._templates[('json', size_bytes)] = template
+        return MessageGenerator._render(template, fresh_timestamp)
+    
+    @staticmethod
+    def generate_xml_message(size_bytes: int, fresh_timestamp: bool = False) -> bytes:
+        """Generate a UTF-8 encoded XML message of approximately the specified size."""
+        template = MessageGenerator._templates.get(('xml', size_bytes))
+        if template is None:
+            template = MessageGenerator._build_xml_template(size_bytes)
+            MessageGenerator._templates[('xml', size_bytes)] = template
+        return MessageGenerator._render(template, fresh_timestamp)
 
 
-class ActiveMQProducer:
-    """Handles connection and message sending to ActiveMQ."""
+class _PendingReceipt:
+    """A frame awaiting the broker's RECEIPT; error is set if the broker answered otherwise."""
     
-    def __init__(self, host: str = 'localhost', port: int = 61613, username: Optional[str] = None, password: Optional[str] = None):
-        """Initialize ActiveMQ producer."""
+    def __init__(self):
+        self.event = threading.Event()
+        self.error = None
+    
+    def resolve(self, error: Optional[str] = None):
+        """Record the outcome and wake up the waiting sender."""
+        self.error = error
+        self.event.set()
+    
+    def wait(self, timeout: float) -> bool:
+        """Wait for an outcome and return False if none arrived within timeout seconds."""
+        return self.event.wait(timeout)
+
+
+class _ReceiptListener(stomp.ConnectionListener):
+    """Wakes up senders waiting for the broker's RECEIPT of a frame."""
+    
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    def expect(self, receipt_id: str) -> _PendingReceipt:
+        """Register a receipt id before its frame is sent and return its pending outcome."""
+        pending = _PendingReceipt()
+        with self._lock:
+            self._pending[receipt_id] = pending
+        return pending
+    
+    def forget(self, receipt_id: str):
+        """Stop waiting for a receipt that did not arrive."""
+        with self._lock:
+            self._pending.pop(receipt_id, None)
+    
+    def on_receipt(self, frame):
+        """Resolve the pending receipt matching the frame's receipt-id, if any."""
+        with self._lock:
+            pending = self._pending.pop(frame.headers.get('receipt-id'), None)
+        if pending:
+            pending.resolve()
+    
+    def on_error(self, frame):
+        """Fail the pending receipt that the broker answered with an ERROR frame."""
+        with self._lock:
+            pending = self._pending.pop(frame.headers.get('receipt-id'), None)
+        if pending:
+            pending.resolve(frame.headers.get('message') or frame.body or 'ERROR frame')
+    
+    def on_disconnected(self):
+        """Fail every pending receipt, since none can arrive on a closed connection."""
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for receipt in pending:
+            receipt.resolve('connection lost')
+
+
+class _Producer:
+    """Connection settings and the per-connection pool shared by the STOMP and AMQP producers."""
+    
+    def __init__(self, host: str, port: int, username: Optional[str] = None, password: Optional[str] = None,
+                 parallel: int = 1):
+        """Initialize producer."""
         self.host = host
         self.port = port
         self.username = username
         self.password = password
+        self.parallel = max(1, parallel)
         self.connection = None
+        self.connections = []
+        self.locks = []
+
+
+class ActiveMQProducer(_Producer):
+    """Handles connection and message sending to ActiveMQ."""
+    
+    def __init__(self, host: str = 'localhost', port: int = 61613, username: Optional[str] = None, password: Optional[str] = None,
+                 parallel: int = 1):
+        """Initialize ActiveMQ producer."""
+        super().__init__(host, port, username, password, parallel)
+        self.listeners = []
+        self.receipt_timeout = 30.0
     
     def connect(self):
-        """Establish connection to ActiveMQ."""
+        """Establish one connection to ActiveMQ per parallel sender."""
         try:
-            self.connection = stomp.Connection([(self.host, self.port)])
+            for _ in range(self.parallel):
+                connection = stomp.Connection([(self.host, self.port)])
+                listener = _ReceiptListener()
+                connection.set_listener('receipts', listener)
+                
+                if self.username and self.password:
+                    connection.connect(self.username, self.password, wait=True)
+                else:
+                    connection.connect(wait=True)
+                
+                self.connections.append(connection)
+                self.locks.append(threading.RLock())
+                self.listeners.append(listener)
             
-            if self.username and self.password:
-                self.connection.connect(self.username, self.password, wait=True)
+            self.connection = self.connections[0]
+            if self.parallel > 1:
+                print(f"✓ Connected to ActiveMQ at {self.host}:{self.port} ({self.parallel} connections)")
             else:
-                self.connection.connect(wait=True)
-            
-            print(f"✓ Connected to ActiveMQ at {self.host}:{self.port}")
+                print(f"✓ Connected to ActiveMQ at {self.host}:{self.port}")
             return True
         except Exception as e:
             print(f"✗ Failed to connect to ActiveMQ: {e}", file=sys.stderr)
+            # Disconnect the connections that did open, since the caller won't disconnect
+            for connection in self.connections:
+                try:
+                    connection.disconnect()
+                except Exception:
+                    pass
+            self.connections, self.locks, self.listeners = [], [], []
             return False
     
     def disconnect(self):
         """Disconnect from ActiveMQ."""
-        if self.connection:
-            try:
-                self.connection.disconnect()
+        if self.connections:
+            # Close each connection on its own, so one failure doesn't leave the rest open
+            failed = False
+            for connection in self.connections:
+                try:
+                    connection.disconnect()
+                except Exception as e:
+                    failed = True
+                    print(f"Warning: Error during disconnect: {e}", file=sys.stderr)
+            if not failed:
                 print("✓ Disconnected from ActiveMQ")
-            except Exception as e:
-                print(f"Warning: Error during disconnect: {e}", file=sys.stderr)
     
-    def send_message(self, queue_name: str, message: str, content_type: str = 'application/json'):
-        """Send a message to the specified queue."""
+    def send_message(self, queue_name: str, message: bytes, content_type: str = 'application/json',
+                     transaction: Optional[str] = None, conn: int = 0):
+        """Send an encoded message to the specified queue, optionally as part of a transaction."""
         try:
             headers = {
                 'content-type': content_type,
                 'persistent': 'true'
             }
-            self.connection.send(destination=f'/queue/{queue_name}', body=message, headers=headers)
+            if transaction:
+                headers['transaction'] = transaction
+            with self.locks[conn]:
+                self.connections[conn].send(destination=f'/queue/{queue_name}', body=message, headers=headers)
+            return True
+        except Exception as e:
+            print(f"✗ Failed to send message: {e}", file=sys.stderr)
+            return False
+    
+    def send_batch(self, queue_name: str, messages: List[bytes], content_type: str = 'application/json',
+                   batch_size: int = 100, conn: int = 0) -> int:
+        """Send messages in transactions of batch_size messages and return how many were committed.
+        
+        Committing a whole batch at once lets the broker sync its journal once per batch
+        instead of once per persistent message. Only the COMMIT asks for a receipt, so there is
+        one broker round-trip per batch. A batch size of 1 sends without transactions.
+        conn selects which of the parallel connections carries the batch.
+        """
+        if batch_size <= 1:
+            return sum(self.send_message(queue_name, message, content_type, conn=conn) for message in messages)
+        
+        connection = self.connections[conn]
+        sent = 0
+        for start in range(0, len(messages), batch_size):
+            batch = messages[start:start + batch_size]
+            # A transaction is bound to its connection, so hold that connection until it ends
+            with self.locks[conn]:
+                tx_id = None
+                try:
+                    tx_id = connection.begin()
+                    for message in batch:
+                        if not self.send_message(queue_name, message, content_type, transaction=tx_id, conn=conn):
+                            raise RuntimeError("batch aborted")
+                    receipt_id = f'receipt-{tx_id}'
+                    committed = self.listeners[conn].expect(receipt_id)
+                    connection.commit(transaction=tx_id, headers={'receipt': receipt_id})
+                    if not committed.wait(self.receipt_timeout):
+                        self.listeners[conn].forget(receipt_id)
+                        # The broker may still have committed the batch, so it is not aborted
+                        print(f"✗ No receipt for batch commit within {self.receipt_timeout:g} seconds; "
+                              f"outcome of {len(batch)} messages unknown, counted as failed", file=sys.stderr)
+                        continue
+                    if committed.error is not None:
+                        print(f"✗ Batch commit of {len(batch)} messages failed: {committed.error}", file=sys.stderr)
+                        continue
+                    sent += len(batch)
+                except Exception as e:
+                    print(f"✗ Failed to send batch: {e}", file=sys.stderr)
+                    if tx_id:
+                        try:
+                            connection.abort(transaction=tx_id)
+                        except Exception:
+                            pass
+        return sent
+
+
+class AMQPProducer(_Producer):
+    """Handles connection and message sending to ActiveMQ over AMQP 1.0."""
+    
+    def __init__(self, host: str = 'localhost', port: int = 5672, username: Optional[str] = None, password: Optional[str] = None,
+                 parallel: int = 1):
+        """Initialize AMQP producer."""
+        super().__init__(host, port, username, password, parallel)
+        self.senders = []
+        self.settle_timeout = 30.0
+    
+    def connect(self):
+        """Establish one AMQP connection to ActiveMQ per parallel sender."""
+        if BlockingConnection is None:
+            print("✗ AMQP support requires qpid-proton (pip install python-qpid-proton)", file=sys.stderr)
+            return False
+        
+        try:
+            credentials = {}
+            if self.username and self.password:
+                credentials = {'user': self.username, 'password': self.password}
+            
+            for _ in range(self.parallel):
+                self.connections.append(BlockingConnection(f'{self.host}:{self.port}', **credentials))
+                self.senders.append({})
+                self.locks.append(threading.RLock())
+            
+            self.connection = self.connections[0]
+            if self.parallel > 1:
+                print(f"✓ Connected to ActiveMQ at {self.host}:{self.port} over AMQP ({self.parallel} connections)")
+            else:
+                print(f"✓ Connected to ActiveMQ at {self.host}:{self.port} over AMQP")
+            return True
+        except Exception as e:
+            print(f"✗ Failed to connect to ActiveMQ: {e}", file=sys.stderr)
+            # Close the connections that did open, since the caller won't disconnect
+            for connection in self.connections:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+            self.connections, self.senders, self.locks = [], [], []
+            return False
+    
+    def disconnect(self):
+        """Disconnect from ActiveMQ."""
+        if self.connections:
+            # Close each connection on its own, so one failure doesn't leave the rest open
+            failed = False
+            for connection in self.connections:
+                try:
+                    connection.close()
+                except Exception as e:
+                    failed = True
+                    print(f"Warning: Error during disconnect: {e}", file=sys.stderr)
+            if not failed:
+                print("✓ Disconnected from ActiveMQ")
+    
+    def _sender(self, queue_name: str, conn: int):
+        """Return the cached sender for queue_name on a connection, creating it on first use."""
+        senders = self.senders[conn]
+        sender = senders.get(queue_name)
+        if sender is None:
+            sender = senders[queue_name] = self.connections[conn].create_sender(queue_name)
+        return sender
+    
+    def send_message(self, queue_name: str, message: bytes, content_type: str = 'application/json',
+                     transaction: Optional[str] = None, conn: int = 0):
+        """Send an encoded message to the specified queue as a durable AMQP message.
+        
+        AMQP sends are not transactional here, so transaction is ignored.
+        """
+        try:
+            with self.locks[conn]:
+                self._sender(queue_name, conn).send(Message(body=message, content_type=content_type, durable=True))
             return True
         except Exception as e:
             print(f"✗ Failed to send message: {e}", file=sys.stderr)
             return False
+    
+    def send_batch(self, queue_name: str, messages: List[bytes], content_type: str = 'application/json',
+                   batch_size: int = 100, conn: int = 0) -> int:
+        """Send messages in groups of batch_size and return how many the broker accepted.
+        
+        Each group is written to the link without waiting, and then the broker's settlement of
+        the whole group is awaited once, so there is one round-trip per batch instead of per message.
+        AMQP batches are not transactional: the broker accepts or rejects each message on its own.
+        """
+        connection = self.connections[conn]
+        sent = 0
+        for start in range(0, len(messages), batch_size):
+            batch = messages[start:start + batch_size]
+            with self.locks[conn]:
+                try:
+                    link = self._sender(queue_name, conn).link
+                    deliveries = [link.send(Message(body=message, content_type=content_type, durable=True))
+                                  for message in batch]
+                    # Pre-settled links never report a remote settlement, as in BlockingSender.send
+                    connection.wait(lambda: all(delivery.settled or link.snd_settle_mode == Link.SND_SETTLED
+                                                for delivery in deliveries),
+                                    timeout=self.settle_timeout, msg=f"Sending batch on sender {link.name}")
+                    rejected = 0
+                    for delivery in deliveries:
+                        if link.snd_settle_mode != Link.SND_SETTLED:
+                            delivery.settle()
+                        if delivery.remote_state in (Delivery.REJECTED, Delivery.RELEASED):
+                            rejected += 1
+                    if rejected:
+                        print(f"✗ Broker rejected or released {rejected} of {len(batch)} messages in batch",
+                              file=sys.stderr)
+                    sent += len(batch) - rejected
+                except Exception as e:
+                    print(f"✗ Failed to send batch: {e}", file=sys.stderr)
+        return sent
 
 
 def parse_arguments():
@@ -140,12 +513,14 @@ def parse_arguments():
     # ActiveMQ connection parameters
     parser.add_argument('--host', type=str, default='localhost',
                         help='ActiveMQ host')
-    parser.add_argument('--port', type=int, default=61613,
-                        help='ActiveMQ STOMP port')
+    parser.add_argument('--port', type=int, default=argparse.SUPPRESS,
+                        help='ActiveMQ port (default: 61613 for STOMP, 5672 for AMQP)')
     parser.add_argument('--username', type=str, default=None,
                         help='ActiveMQ username (optional)')
     parser.add_argument('--password', type=str, default=None,
                         help='ActiveMQ password (optional)')
+    parser.add_argument('--protocol', type=str, choices=['stomp', 'amqp'], default='stomp',
+                        help='Wire protocol (amqp requires qpid-proton)')
     
     # Message parameters
     parser.add_argument('--queue', type=str, required=True,
@@ -158,8 +533,20 @@ def parse_arguments():
                         help='Message send rate (messages per second)')
     parser.add_argument('--format', type=str, choices=['json', 'xml'], default='json',
                         help='Message format (json or xml)')
+    parser.add_argument('--fresh-timestamp', action='store_true',
+                        help='Give every message its own microsecond timestamp instead of one per second')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='Messages per batch: one transaction over STOMP (1 disables transactions), '
+                             'one pipelined, non-transactional group over AMQP')
+    parser.add_argument('--parallel', type=int, default=1,
+                        help='Number of connections sending batches in parallel')
+    parser.add_argument('--progress-every', type=int, default=100,
+                        help='Report progress every N sent messages')
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if 'port' not in args:
+        args.port = 5672 if args.protocol == 'amqp' else 61613
+    return args
 
 
 def main():
@@ -171,25 +558,33 @@ def main():
     print("=" * 60)
     print(f"Configuration:")
     print(f"  Host:     {args.host}:{args.port}")
+    print(f"  Protocol: {args.protocol.upper()}")
     print(f"  Queue:    {args.queue}")
     print(f"  Count:    {args.count} messages")
     print(f"  Size:     {args.size} bytes")
     print(f"  Rate:     {args.rate} msg/sec")
     print(f"  Format:   {args.format.upper()}")
+    print(f"  Batch:    {args.batch_size} messages")
+    print(f"  Parallel: {args.parallel} connections")
     print("=" * 60)
     
     # Create producer
-    producer = ActiveMQProducer(
+    producer_class = AMQPProducer if args.protocol == 'amqp' else ActiveMQProducer
+    producer = producer_class(
         host=args.host,
         port=args.port,
         username=args.username,
-        password=args.password
+        password=args.password,
+        parallel=args.parallel
     )
     
     # Connect to ActiveMQ
     if not producer.connect():
         sys.exit(1)
     
+    # Batches waiting on a parallel sender, in dispatch order
+    executor = None
+    pending = deque()
     try:
         # Calculate delay between messages based on rate
         delay = 1.0 / args.rate if args.rate > 0 else 0
@@ -197,28 +592,72 @@ def main():
         # Determine content type
         content_type = 'application/json' if args.format == 'json' else 'application/xml'
         
+        # Determine message generator
+        if args.format == 'json':
+            generate = MessageGenerator.generate_json_message
+        else:
+            generate = MessageGenerator.generate_xml_message
+        
+        # Pre-generate payload data once so messages only slice it. generate_random_bytes regrows a
+        # pool smaller than two messages, which a small --count would otherwise trigger on first use
+        MessageGenerator.ensure_pool(max(2 * args.size, min(args.size * min(args.count, 1024), 64 * 1024 * 1024)))
+        
         # Send messages
+        batch_size = max(1, args.batch_size)
+        progress_every = max(1, args.progress_every)
         sent_count = 0
         failed_count = 0
         start_time = time.time()
+        start = time.monotonic()
         
-        for i in range(args.count):
-            # Generate message
-            if args.format == 'json':
-                message = MessageGenerator.generate_json_message(args.size)
-            else:
-                message = MessageGenerator.generate_xml_message(args.size)
+        def record(messages, sent):
+            """Update the counters and report progress for a dispatched batch."""
+            nonlocal sent_count, failed_count
+            previous = sent_count
+            sent_count += sent
+            failed_count += len(messages) - sent
+            # Only report when a multiple of progress_every is crossed, and for the final batch
+            if sent and (sent_count // progress_every > previous // progress_every
+                         or sent_count + failed_count == args.count):
+                if len(messages) == 1:
+                    print(f"[{sent_count}/{args.count}] Sent message ({len(messages[0])} bytes)")
+                elif sent == len(messages):
+                    total_bytes = sum(len(message) for message in messages)
+                    print(f"[{sent_count}/{args.count}] Sent batch of {sent} messages ({total_bytes} bytes)")
+                else:
+                    # Which messages failed isn't known here, so no byte count is reported
+                    print(f"[{sent_count}/{args.count}] Sent {sent} of {len(messages)} messages in batch")
+        
+        if producer.parallel > 1:
+            executor = ThreadPoolExecutor(max_workers=producer.parallel)
+        
+        for batch_index, offset in enumerate(range(0, args.count, batch_size)):
+            # Generate batch
+            messages = [generate(args.size, args.fresh_timestamp) for _ in range(min(batch_size, args.count - offset))]
             
-            # Send message
-            if producer.send_message(args.queue, message, content_type):
-                sent_count += 1
-                print(f"[{sent_count}/{args.count}] Sent message ({len(message.encode('utf-8'))} bytes)")
+            # Send batch, round-robin across connections when sending in parallel
+            if executor is None:
+                record(messages, producer.send_batch(args.queue, messages, content_type, batch_size))
             else:
-                failed_count += 1
+                # Bound how many generated batches can queue up ahead of the senders
+                if len(pending) >= 2 * producer.parallel:
+                    done_messages, future = pending.popleft()
+                    record(done_messages, future.result())
+                future = executor.submit(producer.send_batch, args.queue, messages, content_type,
+                                         batch_size, batch_index % producer.parallel)
+                pending.append((messages, future))
             
-            # Rate limiting
-            if delay > 0 and i < args.count - 1:
-                time.sleep(delay)
+            # Rate limiting against absolute deadlines, so generation and send time don't cause drift.
+            # Dispatch is paced from this thread, which also limits the rate of the parallel senders.
+            scheduled = offset + len(messages)
+            if delay > 0 and scheduled < args.count:
+                remaining = start + scheduled * delay - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+        
+        while pending:
+            done_messages, future = pending.popleft()
+            record(done_messages, future.result())
         
         # Summary
         elapsed_time = time.time() - start_time
@@ -233,6 +672,11 @@ def main():
     except KeyboardInterrupt:
         print("\n✗ Interrupted by user")
     finally:
+        if executor is not None:
+            # Drop batches that haven't started, so an interrupt only waits for those in flight
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
         producer.disconnect()
 
 
@@ -27,6 +27,7 @@ def demo_message_producer():
         print(f"{'='*70}\n")
         
         delay = 1.0 / config['rate']
+        start = time.monotonic()
         
         for i in range(config['count']):
             # Generate message
@@ -35,17 +36,20 @@ def demo_message_producer():
             else:
                 message = MessageGenerator.generate_xml_message(config['size'])
             
-            actual_size = len(message.encode('utf-8'))
+            actual_size = len(message)
             print(f"[{i+1}/{config['count']}] Generated {config['format'].upper()} message ({actual_size} bytes)")
             
             # Show first message content
             if i == 0:
-                preview = message[:150] + "..." if len(message) > 150 else message
+                text = message.decode('utf-8')
+                preview = text[:150] + "..." if len(text) > 150 else text
                 print(f"  Preview: {preview}")
             
-            # Simulate delay
+            # Simulate delay against absolute deadlines
             if i < config['count'] - 1:
-                time.sleep(delay)
+                remaining = start + (i + 1) * delay - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
     
     print(f"\n{'='*70}")
     print("Demo completed successfully!")
@@ -0,0 +1,38 @@
+"""Tests for MessageGenerator."""
+
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from activemq_producer import MessageGenerator
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    """Start from an empty payload pool so each test controls its size."""
+    monkeypatch.setattr(MessageGenerator, '_pool', memoryview(b''))
+    monkeypatch.setattr(MessageGenerator, '_pool_off', 0)
+    MessageGenerator.ensure_pool(1000)
+
+
+def test_random_bytes_have_requested_length_across_mixed_lengths(small_pool):
+    # Advance the offset close to the end of the pool, then ask for longer slices
+    for length in [10] * 98 + [400, 7, 999, 3, 500]:
+        assert len(MessageGenerator.generate_random_bytes(length)) == length
+
+
+def test_mixed_size_json_messages_parse(small_pool):
+    MessageGenerator.ensure_pool(4000)
+    for _ in range(100):
+        MessageGenerator.generate_xml_message(300)
+    for size in (2000, 300, 5000, 64, 1024):
+        message = MessageGenerator.generate_json_message(size)
+        assert json.loads(message)["type"] == "test_message"
+
+
+@pytest.mark.parametrize("size, expected", [(100, 132), (256, 241), (1024, 1009)])
+def test_xml_message_sizes_match_elementtree_output(size, expected):
+    message = MessageGenerator.generate_xml_message(size)
+    assert len(message) == expected
+    assert ET.fromstring(message).find("type").text == "test_message"